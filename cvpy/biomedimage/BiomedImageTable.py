@@ -19,6 +19,7 @@
 """ BioMedImage analysis tools """
 
 from typing import Dict, List
+import math
 import struct
 import numpy
 from swat import CASTable
@@ -27,6 +28,9 @@ from cvpy.biomedimage.LabelConnectivity import LabelConnectivity
 from cvpy.utils.RandomNameGenerator import RandomNameGenerator
 from cvpy.utils.ImageUtils import ImageUtils
 
+# Constant factor of the sphericity formula, pi^(1/3) * 6^(2/3), so that the SQL only needs one power() per row
+_SPHERICITY_FACTOR = math.pi ** (1.0 / 3.0) * 6.0 ** (2.0 / 3.0)
+
 
 class BiomedImageTable(ImageTable):
     """
@@ -157,7 +161,8 @@ class BiomedImageTable(ImageTable):
         return pos, ori, spa
 
     def sphericity(self, use_spacing: bool, input_background: float,
-                   label_connectivity: LabelConnectivity, output_table_parms: Dict[str, str] = None) -> CASTable:
+                   label_connectivity: LabelConnectivity, output_table_parms: Dict[str, str] = None,
+                   label_type: str = 'basic') -> CASTable:
         """
         Quantify the sphericity for the given component from this BiomedImageTable.
 
@@ -171,6 +176,8 @@ class BiomedImageTable(ImageTable):
             Specifies the level of connectivity for connected components: LabelConnectivity.FACE or LabelConnectivity.VERTEX
         output_table_parms : :class:'Dict[str,str]'
             Specifies the parameters in the output image table.
+        label_type: :class:'str'
+            Specifies the connected-component labeling algorithm that the quantifybiomedimages action uses.
 
         Returns
         -------
@@ -193,44 +200,182 @@ class BiomedImageTable(ImageTable):
 
         """
 
+        return BiomedImageTable._quantify_sphericity(self.table, ['_path_'], use_spacing, input_background,
+                                                     label_connectivity, output_table_parms, label_type)
+
+    @staticmethod
+    def sphericity_batch(image_tables: List[ImageTable], use_spacing: bool, input_background: float,
+                         label_connectivity: LabelConnectivity, output_table_parms: Dict[str, str] = None,
+                         label_type: str = 'basic') -> CASTable:
+        """
+        Quantify the sphericity for the given components of several image tables in a single pass. The image tables
+        are combined into one table, and the output table contains a _subject_ column holding the position of the
+        source image table in image_tables.
+
+        Parameters
+        ----------
+        image_tables: :class:'List[ImageTable]'
+            Specifies the image tables to quantify. All tables must have the same columns and the same connection.
+        use_spacing: :class:'bool'
+            When set to True, use image spacing in the sphericity calculation.
+        input_background: :class:'float'
+            Specifies the background value in input images.
+        label_connectivity: LabelConnectivity.FACE | LabelConnectivity.VERTEX
+            Specifies the level of connectivity for connected components: LabelConnectivity.FACE or LabelConnectivity.VERTEX
+        output_table_parms : :class:'Dict[str,str]'
+            Specifies the parameters in the output image table.
+        label_type: :class:'str'
+            Specifies the connected-component labeling algorithm that the quantifybiomedimages action uses.
+
+        Returns
+        -------
+        :class:'CASTable'
+
+        Examples
+        --------
+        >>> # Import classes
+        >>> from swat import CAS
+        >>> from cvpy.biomedimage.BiomedImageTable import BiomedImageTable
+        >>> from cvpy.biomedimage.LabelConnectivity import LabelConnectivity
+        >>> ## Connect to CAS
+        >>> s = CAS("example.com", 5570)
+        >>> # Construct Biomed objects, one per subject
+        >>> subjects = [BiomedImageTable(s.CASTable(...)), BiomedImageTable(s.CASTable(...))]
+        >>> # Call the API
+        >>> output_table = BiomedImageTable.sphericity_batch(subjects, use_spacing, ...., label_connectivity)
+
+        """
+
+        if not image_tables:
+            raise Exception('The image_tables parameter must contain at least one image table.')
+
+        connection = image_tables[0].connection
+
+        # Load the actionsets, since the image tables need not be BiomedImageTables
+        connection.loadactionset('biomedimage')
+        connection.loadactionset('fedsql')
+
+        # Qualify each table name with its caslib, so tables outside the active caslib can be read
+        table_names = []
+        for image_table in image_tables:
+            caslib = image_table.table.params.get('caslib')
+            table_name = f'"{image_table.table.name}"'
+            table_names.append(f'"{caslib}".{table_name}' if caslib else table_name)
+
+        # Combine the image tables into one table, tagging the rows of each table with its subject number
+        subject_sql = ' union all '.join(f'select {subject} as _subject_, t{subject}.* from {table_name} as t{subject}'
+                                         for subject, table_name in enumerate(table_names))
+        connection.fedsql.execdirect(f'''create table _sphericity_batch_ {{options replace=true}} as {subject_sql}''')
+
+        sphericity = BiomedImageTable._quantify_sphericity(connection.CASTable('_sphericity_batch_'),
+                                                           ['_subject_', '_path_'], use_spacing, input_background,
+                                                           label_connectivity, output_table_parms, label_type)
+
+        # Delete the combined table, since it holds a copy of every subject's images
+        connection.table.dropTable(name='_sphericity_batch_')
+
+        return sphericity
+
+    @staticmethod
+    def _quantify_sphericity(table: CASTable, copy_vars: List[str], use_spacing: bool, input_background: float,
+                             label_connectivity: LabelConnectivity,
+                             output_table_parms: Dict[str, str] = None, label_type: str = 'basic') -> CASTable:
+        """
+        Quantify the sphericity of the components in a CASTable.
+
+        Parameters
+        ----------
+        table: :class:'CASTable'
+            Specifies the table that contains the images.
+        copy_vars: :class:'List[str]'
+            Specifies which columns to copy to the output table.
+        use_spacing: :class:'bool'
+            When set to True, use image spacing in the sphericity calculation.
+        input_background: :class:'float'
+            Specifies the background value in input images.
+        label_connectivity: LabelConnectivity.FACE | LabelConnectivity.VERTEX
+            Specifies the level of connectivity for connected components.
+        output_table_parms : :class:'Dict[str,str]'
+            Specifies the parameters in the output table.
+        label_type: :class:'str'
+            Specifies the connected-component labeling algorithm that the quantifybiomedimages action uses.
+
+        Returns
+        -------
+        :class:'CASTable'
+        """
+
+        connection = table.get_connection()
+
         # If output_table_parms is not passed, set it as an empty dict
         if not output_table_parms:
             output_table_parms = dict()
 
         random_name_generator = RandomNameGenerator()
 
-        # Quantify the volume and perimeter of the given component.
-        self.connection.biomedimage.quantifybiomedimages(images=dict(table=self.table),
-                                                         copyvars=['_path_'],
-                                                         region='COMPONENT',
-                                                         quantities=[
-                                                             dict(quantityparameters=dict(quantitytype='perimeter')),
-                                                             dict(quantityparameters=dict(quantitytype='content',
-                                                                                          useSpacing=use_spacing))
-                                                             ],
-                                                         labelparameters=dict(labelType='basic',
-                                                                              connectivity=label_connectivity.name),
-                                                         inputbackground=input_background,
-                                                         casout=dict(name='quantify'),
-                                                         )
+        # Quantify the volume and perimeter of the given component
+        BiomedImageTable._compute_quantities(table, ['perimeter', 'content'], copy_vars, use_spacing,
+                                             input_background, label_connectivity, label_type)
 
         if 'name' not in output_table_parms:
             output_table_parms['name'] = random_name_generator.generate_name()
 
-        sphericity = self.connection.CASTable(**output_table_parms)
+        sphericity = connection.CASTable(**output_table_parms)
 
         # Compute sphericity based on perimeter and volume of the lesion
-        self.connection.fedsql.execdirect(f'''
+        connection.fedsql.execdirect(f'''
                     create table "{sphericity.name}" as 
-                    select _path_,_perimeter_,_content_, (power(pi(), 1.0/3.0) * power(6*_content_, 2.0/3.0))/_perimeter_ as 
-                    sphericity from quantify
+                    select {','.join(copy_vars)},_perimeter_,_content_, {_SPHERICITY_FACTOR!r} * power(_content_, 2.0/3.0)/_perimeter_ as 
+                    sphericity from _quantify_
                     ''')
 
-        # Delete the quantify table
-        self.connection.table.dropTable(name='quantify')
-
         return sphericity
 
+    @staticmethod
+    def _compute_quantities(table: CASTable, quantity_list: List[str], copy_vars: List[str], use_spacing: bool,
+                            input_background: float, label_connectivity: LabelConnectivity,
+                            label_type: str = 'basic') -> None:
+        """
+        Quantify the components in a CASTable into the session-scoped _quantify_ table, which is replaced on every
+        call instead of being dropped.
+
+        Parameters
+        ----------
+        table: :class:'CASTable'
+            Specifies the table that contains the images.
+        quantity_list: :class:'List[str]'
+            Specifies the quantity types to compute, such as 'perimeter' and 'content'. Perimeter is the most
+            expensive quantity, so request it only when it is needed.
+        copy_vars: :class:'List[str]'
+            Specifies which columns to copy to the _quantify_ table.
+        use_spacing: :class:'bool'
+            When set to True, use image spacing in the content calculation.
+        input_background: :class:'float'
+            Specifies the background value in input images.
+        label_connectivity: LabelConnectivity.FACE | LabelConnectivity.VERTEX
+            Specifies the level of connectivity for connected components.
+        label_type: :class:'str'
+            Specifies the connected-component labeling algorithm that the quantifybiomedimages action uses.
+        """
+
+        quantities = []
+        for quantity_type in quantity_list:
+            quantity_parameters = dict(quantitytype=quantity_type)
+            if quantity_type == 'content':
+                quantity_parameters['useSpacing'] = use_spacing
+            quantities.append(dict(quantityparameters=quantity_parameters))
+
+        connection = table.get_connection()
+        connection.biomedimage.quantifybiomedimages(images=dict(table=table),
+                                                    copyvars=copy_vars,
+                                                    region='COMPONENT',
+                                                    quantities=quantities,
+                                                    labelparameters=dict(labelType=label_type,
+                                                                         connectivity=label_connectivity.name_str),
+                                                    inputbackground=input_background,
+                                                    casout=dict(name='_quantify_', replace=True, promote=False),
+                                                    )
+
     def morphological_gradient(self, kernel_width: int = 3, kernel_height: int = 3, copy_vars: List[str] = None,
                                output_table_parms: Dict[str, str] = None):
         """
@@ -4,6 +4,7 @@ from enum import Enum
 class LabelConnectivity(Enum):
     FACE = 1
     VERTEX = 2
-    
-    
-    
\ No newline at end of file
+
+    def __init__(self, value):
+        # Cache the member name as a plain attribute so hot paths avoid the Enum name descriptor
+        self.name_str = self.name
@@ -21,6 +21,7 @@
 import sys
 import struct
 import numpy as np
+from types import MappingProxyType
 from typing import List, Dict
 from warnings import warn
 from swat import CASTable
@@ -28,6 +29,14 @@ from cvpy.base.ImageTable import ImageTable
 from cvpy.utils.RandomNameGenerator import RandomNameGenerator
 from enum import *
 
+# Binary operations used by mask_image on the joined _images_to_mask_ table, for decoded and encoded masks
+_MASK_DECODED_OPERATION = MappingProxyType(dict(binaryOperationType="MASK_SPECIFIC",
+                                                image="seg",
+                                                dimension="dim",
+                                                resolution="res",
+                                                imageFormat="form"))
+_MASK_ENCODED_OPERATION = MappingProxyType(dict(binaryOperationType="MASK_SPECIFIC", image="seg"))
+
 
 class NaturalImageTable(ImageTable):
     """
@@ -88,7 +97,7 @@ class NaturalImageTable(ImageTable):
         add_columns : :class:'List(str)'
             Specifies extra columns to add to the output table.
         copy_vars : :class:`List(str)`
-            Specifies which columns to copy to the output image table.
+            Specifies which columns to copy to the output image table. Only _id_ is copied by default.
         output_table_parms : :class:`Dict[str,str]`
             Specifies the parameters in the output image table.
         Returns
@@ -99,6 +108,13 @@ class NaturalImageTable(ImageTable):
         if not output_table_parms:
             output_table_parms = dict()
 
+        # Copy only the image identifier unless other columns are requested
+        if copy_vars is None:
+            copy_vars = ['_id_']
+        elif self.image.lower() in [c.lower() for c in copy_vars]:
+            warn(f'Copying the image column {self.image} duplicates the image binaries in the output table. '
+                 f'Leave the image column out of copy_vars.')
+
         # Create CAS Table
         if 'name' not in output_table_parms:
             output_table_parms['name'] = RandomNameGenerator().generate_name()
@@ -106,58 +122,63 @@ class NaturalImageTable(ImageTable):
         cas_table = self.connection.CASTable(**output_table_parms)
 
         ###############################################
-        ########### Mask Tbl Decoded ##################
+        ############ Mask In Image Table ##############
         ###############################################
-        if mask.has_decoded_images():
-
-            # List of columns that will be alternated
-            alter_columns = [dict(name=mask.image, rename="seg"),
-                             dict(name=mask.dimension, rename="dim"),
-                             dict(name=mask.resolution, rename="res"),
-                             dict(name=mask.imageFormat, rename="form")]
+        if mask.table.name.lower() == self.table.name.lower() and \
+                str(mask.table.params.get('caslib')).lower() == str(self.table.params.get('caslib')).lower():
 
-            # SQL string to create the mask table
-            fed_sql_str = f'''create table _images_to_mask_ {{options replace=true}} as 
-                select a.seg, a.dim, a.res, a.form, b.* 
-                from "{mask.table.name}" as a right join "{self.table.name}" as b 
-                on a._id_=b._id_ '''
+            # The mask columns are already in this table, so reference them directly and skip the join
+            _images_to_mask_ = self.table
 
             # Dictionary for specifying information in our binary operation
-            binary_operation_dict = dict(binaryOperationType="MASK_SPECIFIC",
-                                         image="seg", 
-                                         dimension="dim",
-                                         resolution="res", 
-                                         imageFormat="form")
+            if mask.has_decoded_images():
+                binary_operation_dict = dict(_MASK_DECODED_OPERATION,
+                                             image=mask.image,
+                                             dimension=mask.dimension,
+                                             resolution=mask.resolution,
+                                             imageFormat=mask.imageFormat)
+            else:
+                binary_operation_dict = dict(_MASK_ENCODED_OPERATION, image=mask.image)
 
-        ###############################################
-        ############# Mask Tbl Encoded ################
-        ###############################################
         else:
-            # List of columns that will be alternated
-            alter_columns = [dict(name=mask.image, rename="seg")]
-
-            # SQL string to create the mask table
-            fed_sql_str = f'''create table _images_to_mask_ {{options replace=true}} as 
-                select a.seg, b.* 
-                from "{mask.table.name}" as a right join "{self.table.name}" as b 
-                on a._id_=b._id_ '''
-
-            # Dictionary for specifying information in our binary operation
-            binary_operation_dict = dict(binaryOperationType="MASK_SPECIFIC", image="seg")
+            ###############################################
+            ########### Mask Tbl Decoded ##################
+            ###############################################
+            if mask.has_decoded_images():
+
+                # SQL string to create the mask table, renaming the mask columns inline
+                fed_sql_str = f'''create table _images_to_mask_ {{options replace=true}} as 
+                    select a.{mask.image} as seg, a.{mask.dimension} as dim, a.{mask.resolution} as res, 
+                    a.{mask.imageFormat} as form, b.* 
+                    from "{mask.table.name}" as a right join "{self.table.name}" as b 
+                    on a._id_=b._id_ '''
+
+                # Dictionary for specifying information in our binary operation
+                binary_operation_dict = dict(_MASK_DECODED_OPERATION)
+
+            ###############################################
+            ############# Mask Tbl Encoded ################
+            ###############################################
+            else:
+                # SQL string to create the mask table, renaming the mask column inline
+                fed_sql_str = f'''create table _images_to_mask_ {{options replace=true}} as 
+                    select a.{mask.image} as seg, b.* 
+                    from "{mask.table.name}" as a right join "{self.table.name}" as b 
+                    on a._id_=b._id_ '''
+
+                # Dictionary for specifying information in our binary operation
+                binary_operation_dict = dict(_MASK_ENCODED_OPERATION)
+
+            # Create Images to Mask Table
+            _images_to_mask_ = self.connection.CASTable("_images_to_mask_", replace=True)
+
+            # SQL Statement to join tables
+            self.connection.fedsql.execdirect(fed_sql_str)
 
         ###############################################
         ############### Masking Step ##################
         ###############################################
 
-        # Change column names so that we can merge tables
-        self.connection.table.altertable(name=mask.table, columns=alter_columns)
-
-        # Create Images to Mask Table
-        _images_to_mask_ = self.connection.CASTable("_images_to_mask_", replace=True)
-
-        # SQL Statement to join tables
-        self.connection.fedsql.execdirect(fed_sql_str)
-
         # Masking step
         self.connection.image.processimages(
             table=_images_to_mask_,
@@ -171,6 +192,7 @@ class NaturalImageTable(ImageTable):
         )
 
         # Delete our temporary table
-        self.connection.table.dropTable(_images_to_mask_)
+        if _images_to_mask_ is not self.table:
+            self.connection.table.dropTable(_images_to_mask_)
 
         return NaturalImageTable(cas_table)
@@ -25,6 +25,7 @@ from swat import CAS
 
 from cvpy.base.ImageTable import ImageTable
 from cvpy.base.ImageType import ImageType
+from cvpy.biomedimage.BiomedImageTable import BiomedImageTable
 from cvpy.biomedimage.LabelConnectivity import LabelConnectivity
 
 
@@ -111,6 +112,38 @@ class TestBiomedImage(unittest.TestCase):
         self.assertTrue(output is not None)
         self.assertAlmostEqual(image_rows['SPHERICITY'][0], 0.31121426716017353)
 
+    # Load two different biomed images and quantify the sphericity of both tables in one batch.
+    def test_quantify_sphericity_batch(self):
+        # Load the input images
+        subjects = [ImageTable.load(self.s, path=path, load_parms={'caslib': 'dlib', 'decode': True},
+                                    output_table_parms={'name': f'subject{i}', 'replace': True})
+                    for i, path in enumerate(['biomedimg/Prostate3T-01-0001.nii', 'TestMasking/simpleGray.nii'])]
+
+        # Compute the sphericity
+        output = BiomedImageTable.sphericity_batch(subjects, use_spacing=True, input_background=0,
+                                                   label_connectivity=LabelConnectivity.FACE,
+                                                   output_table_parms={'replace': True})
+
+        image_rows = output.to_frame()
+
+        # Assert the sphericity result of each subject matches the result of its own sphericity call
+        for subject, subject_table in enumerate(subjects):
+            expected = subject_table.sphericity(use_spacing=True, input_background=0,
+                                                label_connectivity=LabelConnectivity.FACE,
+                                                output_table_parms={'replace': True})
+            expected_rows = sorted(expected.to_frame()['SPHERICITY'])
+
+            subject_rows = sorted(image_rows[image_rows['_SUBJECT_'] == subject]['SPHERICITY'])
+            self.assertEqual(len(subject_rows), len(expected_rows))
+            for sphericity, expected_sphericity in zip(subject_rows, expected_rows):
+                self.assertAlmostEqual(sphericity, expected_sphericity)
+
+    def test_quantify_sphericity_batch_empty(self):
+        # Assert that an empty list of image tables is rejected
+        with self.assertRaisesRegex(Exception, 'at least one image table'):
+            BiomedImageTable.sphericity_batch([], use_spacing=True, input_background=0,
+                                              label_connectivity=LabelConnectivity.FACE)
+
     def test_morphological_gradient_3d_grayscale_image(self):
         # Load the input image
         input = ImageTable.load(self.s, path='TestMasking/simpleGray.nii', load_parms={'caslib': 'dlib'})
@@ -24,6 +24,7 @@ import swat
 import xmlrunner
 
 from cvpy.base.ImageTable import ImageTable
+from cvpy.base.ImageType import ImageType
 
 
 def load(self, path):
@@ -164,6 +165,72 @@ class TestImage(unittest.TestCase):
         new_img_arr = np.asarray(self.s.image.fetchImages(table=new_img.table).Images.Image[0])
         self.assertTrue(np.array_equal(new_img_arr, test_arr))
 
+    def test_mask_mask_in_image_table(self):
+        # Load the image
+        img = ImageTable.load(self.s, path="imagetypes/gray_3x3.png", load_parms={'caslib': 'dlib', 'decode': True},
+                              output_table_parms={'name': 'image', 'replace': True})
+
+        # Load the mask image
+        smask = ImageTable.load(self.s, path="imagetypes/gray_2_3x3.png", load_parms={'caslib': 'dlib', 'decode': True},
+                                output_table_parms={'name': 'mask', 'replace': True})
+
+        # Combine the image and the mask into one table, keeping the mask in separate columns
+        self.s.loadactionset('fedsql')
+        self.s.fedsql.execdirect('''create table image_and_mask {options replace=true} as 
+            select a._image_ as mask_image, a._dimension_ as mask_dim, a._resolution_ as mask_res, 
+            a._imageFormat_ as mask_form, b.* 
+            from "mask" as a inner join "image" as b 
+            on a._id_=b._id_ ''')
+        self.s.table.altertable(name='image_and_mask', columns=[{'name': '_image_', 'binaryType': 'image'},
+                                                                {'name': 'mask_image', 'binaryType': 'image'}])
+
+        combined = self.s.CASTable('image_and_mask')
+        img = ImageTable.from_table(combined, image_type=ImageType.NATURAL)
+        smask = ImageTable(combined, image='mask_image', dimension='mask_dim', resolution='mask_res',
+                           imageFormat='mask_form')
+
+        # Masking
+        new_img = img.mask_image(smask, decode=False)
+
+        test_arr = np.array(
+            [[0, 0, 255],
+             [0, 255, 255],
+             [0, 128, 0]]
+        )
+
+        new_img_arr = np.asarray(self.s.image.fetchImages(table=new_img.table).Images.Image[0])
+        self.assertTrue(np.array_equal(new_img_arr, test_arr))
+
+    def test_mask_default_copy_vars(self):
+        # Load the image
+        img = ImageTable.load(self.s, path="imagetypes/gray_3x3.png", load_parms={'caslib': 'dlib', 'decode': True},
+                              output_table_parms={'replace': True})
+
+        # Load the mask image
+        smask = ImageTable.load(self.s, path="imagetypes/gray_2_3x3.png", load_parms={'caslib': 'dlib', 'decode': True},
+                                output_table_parms={'replace': True})
+
+        # Masking
+        new_img = img.mask_image(smask, decode=False)
+
+        # Assert that only the image identifier is copied by default
+        columns = [column.lower() for column in new_img.table.columns]
+        self.assertIn('_id_', columns)
+        self.assertNotIn('seg', columns)
+
+    def test_mask_copy_image_column_warning(self):
+        # Load the image
+        img = ImageTable.load(self.s, path="imagetypes/gray_3x3.png", load_parms={'caslib': 'dlib', 'decode': True},
+                              output_table_parms={'replace': True})
+
+        # Load the mask image
+        smask = ImageTable.load(self.s, path="imagetypes/gray_2_3x3.png", load_parms={'caslib': 'dlib', 'decode': True},
+                                output_table_parms={'replace': True})
+
+        # Assert that copying the image column warns
+        with self.assertWarns(UserWarning):
+            img.mask_image(smask, decode=False, copy_vars=[img.image, '_id_'])
+
 
 if __name__ == '__main__':
     if len(sys.argv) > 1: